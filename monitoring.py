@@ -0,0 +1,303 @@
+# Modul monitoring drift untuk model prediksi watch_time_proxy.
+#
+# Pipeline di notebook_python.py hanya melatih model satu kali. Modul ini menyimpan
+# ringkasan distribusi (histogram streaming) dari fitur training, membandingkan
+# setiap batch data baru menggunakan PSI dan KS secara vektor, serta menghitung
+# rolling MAE dari prediksi live. Retrain rf_model / lr_model hanya dijalankan
+# (di background thread) ketika drift melewati threshold.
+
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+
+# Konstanta kecil untuk menghindari log(0) saat menghitung PSI
+EPS = 1e-6
+
+
+def retrain_models(models, X, y):
+    """Melatih ulang salinan (clone) dari setiap model pada data terbaru.
+
+    Model lama tidak diubah, sehingga tetap bisa dipakai untuk prediksi
+    selama proses retrain berjalan.
+    """
+    new_models = {}
+    for name, model in models.items():
+        new_model = clone(model)
+        new_model.fit(X, y)
+        new_models[name] = new_model
+    return new_models
+
+
+class DriftMonitor:
+    """Monitoring drift fitur dan error prediksi dengan trigger retrain otomatis.
+
+    Parameter
+    ---------
+    models : dict
+        Model yang sedang dipakai, misalnya {'Linear Regression': lr_model, 'Random Forest': rf_model}.
+    retrain_fn : callable, opsional
+        Fungsi ``retrain_fn(X, y)`` yang menerima batch berlabel terbaru dari buffer dan
+        mengembalikan dict model baru, atau tuple (models, X_ref) jika data fitur untuk
+        histogram referensi berbeda dari X. Default: ``retrain_models`` pada model saat ini.
+    n_bins : int
+        Jumlah bin histogram per fitur (berbasis kuantil data training).
+    psi_threshold, ks_threshold : float
+        Batas PSI / KS per fitur yang dianggap drift.
+    mae_threshold : float, opsional
+        Batas rolling MAE prediksi live. Jika None, MAE tidak dipakai sebagai trigger.
+    window : int
+        Jumlah prediksi terakhir yang dipakai untuk rolling MAE.
+    buffer_size : int
+        Jumlah baris berlabel terakhir yang disimpan sebagai data retrain.
+    min_retrain_rows : int
+        Jumlah minimum baris berlabel di buffer (dan baris data referensi baru) sebelum
+        retrain boleh dijalankan, supaya model dan kuantil histogram tidak dibangun dari
+        segelintir baris.
+    chunk_size : int
+        Jumlah baris per chunk saat menghitung histogram, agar memori tetap kecil.
+    """
+
+    def __init__(self, models, retrain_fn=None, n_bins=10, psi_threshold=0.2,
+                 ks_threshold=0.1, mae_threshold=None, window=1000, buffer_size=100_000,
+                 min_retrain_rows=1000, chunk_size=50_000):
+        self.models = dict(models)
+        self.retrain_fn = retrain_fn
+        self.n_bins = n_bins
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.mae_threshold = mae_threshold
+        self.window = window
+        self.buffer_size = buffer_size
+        self.min_retrain_rows = min_retrain_rows
+        self.chunk_size = chunk_size
+
+        self.features = None
+        self.edges = None
+        self.ref_counts = None
+
+        # Ring buffer untuk absolute error prediksi live
+        self._errors = np.zeros(window, dtype=float)
+        self._n_errors = 0
+        self._pos = 0
+
+        # Buffer batch berlabel terbaru (X, y) yang dipakai sebagai data retrain
+        self._buffer = deque()
+        self._buffer_rows = 0
+
+        self._lock = threading.Lock()
+        self._retrain_thread = None
+        self.retrain_count = 0
+        self.last_error = None
+
+    # ------------------------------------------------------------------
+    # Histogram referensi
+    # ------------------------------------------------------------------
+    def fit_reference(self, X):
+        """Menentukan batas bin dari data training dan menyimpan histogram referensinya."""
+        reference = self._build_reference(X)
+        with self._lock:
+            self.features, self.edges, self.ref_counts = reference
+        return self
+
+    def _build_reference(self, X):
+        """Menghitung (features, edges, ref_counts) dari data training."""
+        X = pd.DataFrame(X)
+        features = list(X.columns)
+        values = X.to_numpy(dtype=float)
+
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        col_edges = []
+        for j in range(values.shape[1]):
+            column = values[:, j][~np.isnan(values[:, j])]
+            unique = np.unique(column)
+            if len(unique) <= 2:
+                # Kolom dummy (cat_*, day_*): batas dari nilai uniknya ditambah 0, supaya
+                # nilai 0 dan 1 selalu masuk bin berbeda meskipun hampir semua baris bernilai 1
+                col_edges.append(np.union1d(unique, [0.0]))
+            else:
+                # Fitur numerik: batas bin diambil dari kuantil internal
+                col_edges.append(np.unique(np.quantile(column, quantiles)))
+
+        # Padding dengan +inf supaya semua fitur punya jumlah bin yang sama (bin kosong tidak berpengaruh ke PSI/KS)
+        n_edges = max(len(e) for e in col_edges)
+        edges = np.full((len(col_edges), n_edges), np.inf)
+        for j, e in enumerate(col_edges):
+            edges[j, :len(e)] = e
+        return features, edges, self._histogram(X, features, edges)
+
+    def partial_fit_reference(self, X):
+        """Menambahkan data training (per chunk) ke histogram referensi tanpa mengubah batas bin."""
+        counts = self._histogram(X, self.features, self.edges)
+        with self._lock:
+            self.ref_counts = self.ref_counts + counts
+        return self
+
+    def _histogram(self, X, features, edges):
+        """Menghitung histogram semua fitur sekaligus, diproses per chunk."""
+        values = pd.DataFrame(X)[features].to_numpy(dtype=float)
+        n_features, n_edges = edges.shape
+        counts = np.zeros(n_features * (n_edges + 1), dtype=float)
+        offsets = np.arange(n_features) * (n_edges + 1)
+
+        for start in range(0, len(values), self.chunk_size):
+            chunk = values[start:start + self.chunk_size]
+            # Index bin = jumlah batas yang lebih kecil dari nilai (setara searchsorted side='left')
+            bins = (chunk[:, :, None] > edges[None, :, :]).sum(axis=2)
+            valid = ~np.isnan(chunk)
+            flat = (bins + offsets[None, :])[valid]
+            counts += np.bincount(flat, minlength=counts.size)
+
+        return counts.reshape(n_features, n_edges + 1)
+
+    # ------------------------------------------------------------------
+    # Perbandingan batch baru
+    # ------------------------------------------------------------------
+    def compare(self, X_batch):
+        """Menghitung PSI dan KS setiap fitur antara data referensi dan batch baru.
+
+        KS dihitung dari CDF histogram (bukan dari data mentah), sehingga nilainya
+        merupakan pendekatan dari statistik KS dua sampel.
+        """
+        with self._lock:
+            features, edges, ref_counts = self.features, self.edges, self.ref_counts
+        if ref_counts is None:
+            raise ValueError("Histogram referensi belum dibuat, panggil fit_reference() terlebih dahulu.")
+
+        batch_counts = self._histogram(X_batch, features, edges)
+        p = ref_counts / np.maximum(ref_counts.sum(axis=1, keepdims=True), 1)
+        q = batch_counts / np.maximum(batch_counts.sum(axis=1, keepdims=True), 1)
+
+        p_safe = np.clip(p, EPS, None)
+        q_safe = np.clip(q, EPS, None)
+        psi = ((q_safe - p_safe) * np.log(q_safe / p_safe)).sum(axis=1)
+        ks = np.abs(np.cumsum(p, axis=1) - np.cumsum(q, axis=1)).max(axis=1)
+
+        report = pd.DataFrame({'psi': psi, 'ks': ks}, index=features)
+        report['drift'] = (report['psi'] > self.psi_threshold) | (report['ks'] > self.ks_threshold)
+        return report
+
+    # ------------------------------------------------------------------
+    # Rolling MAE prediksi live
+    # ------------------------------------------------------------------
+    def record_predictions(self, y_true, y_pred):
+        """Menyimpan absolute error prediksi live ke ring buffer."""
+        errors = np.abs(np.asarray(y_true, dtype=float) - np.asarray(y_pred, dtype=float))[-self.window:]
+        with self._lock:
+            idx = (self._pos + np.arange(len(errors))) % self.window
+            self._errors[idx] = errors
+            self._pos = (self._pos + len(errors)) % self.window
+            self._n_errors = min(self._n_errors + len(errors), self.window)
+
+    @property
+    def rolling_mae(self):
+        """MAE dari `window` prediksi terakhir (NaN jika belum ada prediksi)."""
+        with self._lock:
+            if self._n_errors == 0:
+                return float('nan')
+            if self._n_errors < self.window:
+                return float(self._errors[:self._n_errors].mean())
+            return float(self._errors.mean())
+
+    # ------------------------------------------------------------------
+    # Trigger retrain
+    # ------------------------------------------------------------------
+    def add_labeled(self, X_batch, y_true):
+        """Menyimpan batch berlabel ke buffer retrain (baris terlama dibuang jika penuh)."""
+        X_batch = pd.DataFrame(X_batch)
+        y_true = pd.Series(np.asarray(y_true, dtype=float), index=X_batch.index)
+        with self._lock:
+            self._buffer.append((X_batch, y_true))
+            self._buffer_rows += len(X_batch)
+            self._trim_buffer()
+
+    def _trim_buffer(self):
+        # Dipanggil dengan _lock sudah dipegang
+        while self._buffer_rows > self.buffer_size and len(self._buffer) > 1:
+            old_X, _ = self._buffer.popleft()
+            self._buffer_rows -= len(old_X)
+
+    def update(self, X_batch, y_true=None, y_pred=None):
+        """Memproses satu batch data baru dan memulai retrain jika terjadi drift.
+
+        Batch yang memiliki label (y_true) ikut disimpan sebagai data retrain.
+        Mengembalikan tuple (report, retrain_started).
+        """
+        report = self.compare(X_batch)
+        if y_true is not None:
+            self.add_labeled(X_batch, y_true)
+            if y_pred is not None:
+                self.record_predictions(y_true, y_pred)
+
+        mae = self.rolling_mae
+        mae_drift = self.mae_threshold is not None and not np.isnan(mae) and mae > self.mae_threshold
+        retrain_started = False
+        if report['drift'].any() or mae_drift:
+            retrain_started = self.trigger_retrain()
+        return report, retrain_started
+
+    @property
+    def is_retraining(self):
+        with self._lock:
+            return self._retrain_running()
+
+    def _retrain_running(self):
+        # Dipanggil dengan _lock sudah dipegang
+        return self._retrain_thread is not None and self._retrain_thread.is_alive()
+
+    def trigger_retrain(self):
+        """Menjalankan retrain di background thread memakai data di buffer.
+
+        Retrain tidak dijalankan ganda, dan tidak dijalankan sebelum buffer berisi
+        minimal `min_retrain_rows` baris berlabel.
+        """
+        with self._lock:
+            if self._retrain_running() or self._buffer_rows < self.min_retrain_rows:
+                return False
+            batches = list(self._buffer)
+            self._buffer.clear()
+            self._buffer_rows = 0
+            self._retrain_thread = threading.Thread(target=self._run_retrain, args=(batches,), daemon=True)
+            self._retrain_thread.start()
+        return True
+
+    def _run_retrain(self, batches):
+        X = pd.concat([batch for batch, _ in batches])
+        y = pd.concat([labels for _, labels in batches])
+        try:
+            if self.retrain_fn is None:
+                result = retrain_models(self.models, X, y)
+            else:
+                result = self.retrain_fn(X, y)
+            new_models, X_ref = result if isinstance(result, tuple) else (result, X)
+            if len(X_ref) < self.min_retrain_rows:
+                raise ValueError(
+                    f"Data referensi baru hanya {len(X_ref)} baris, minimal {self.min_retrain_rows} baris."
+                )
+            reference = self._build_reference(X_ref)
+        except Exception as exc:  # error retrain tidak boleh menghentikan proses monitoring
+            with self._lock:
+                self.last_error = exc
+                # Batch berlabel dikembalikan ke depan buffer supaya tidak hilang
+                self._buffer.extendleft(reversed(batches))
+                self._buffer_rows += len(X)
+                self._trim_buffer()
+            return
+        with self._lock:
+            self.models.update(new_models)
+            # Histogram referensi ikut diganti ke distribusi data training yang baru,
+            # supaya batch berikutnya tidak langsung dianggap drift lagi
+            self.features, self.edges, self.ref_counts = reference
+            self.retrain_count += 1
+            self.last_error = None
+            # Error lama berasal dari model sebelumnya, jadi rolling MAE direset
+            self._n_errors = 0
+            self._pos = 0
+
+    def wait_for_retrain(self, timeout=None):
+        """Menunggu retrain yang sedang berjalan selesai (berguna untuk batch job)."""
+        if self._retrain_thread is not None:
+            self._retrain_thread.join(timeout)
@@ -0,0 +1,584 @@
+# Pipeline command-line untuk prediksi watch_time_proxy.
+#
+# notebook_python.py berjalan linear dari atas ke bawah, sehingga perubahan kecil di
+# cell Random Forest membuat load CSV, plot EDA, dan featurization ikut dijalankan ulang.
+# Modul ini memecah alur notebook menjadi DAG stage:
+#
+#   load -> profile (EDA)
+#   load -> featurize -> train_lr / train_rf -> evaluate -> report
+#
+# Output setiap stage disimpan di disk dengan key hash dari kode stage, parameter,
+# isi file input, dan key stage sebelumnya. Hanya stage yang berubah (dan stage
+# setelahnya) yang dijalankan ulang, dan stage yang tidak saling bergantung
+# (misalnya plot EDA dan training model) dijalankan paralel.
+#
+# Contoh penggunaan:
+#   python pipeline.py train
+#   python pipeline.py report --skip-eda
+#   python pipeline.py serve --port 8000
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import joblib
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from explainability import permutation_importance_summary
+from monitoring import DriftMonitor, retrain_models
+
+
+NUMERICAL_FEATURES = ['view', 'publish_hour']
+# Kolom mentah yang wajib ada di setiap record serving
+REQUIRED_FIELDS = ['view', 'publish_time']
+TARGET = 'watch_time_proxy'
+
+DROP_COLS = [
+    'channel_id', 'category_id', 'live_status', 'local_title',
+    'local_description', 'duration', 'dimension', 'definition',
+    'caption', 'license_status', 'allowed_region', 'blocked_region',
+    'dislike', 'favorite', 'publish_time', 'description', 'tags',
+    'title', 'channel_name', 'trending_time'
+]
+
+
+# ----------------------------------------------------------------------
+# Helper yang dipakai bersama oleh beberapa stage
+# ----------------------------------------------------------------------
+def add_time_features(df):
+    """Ekstraksi jam dan hari publikasi dari kolom publish_time."""
+    df['publish_time'] = pd.to_datetime(df['publish_time'], errors='coerce')
+    df['publish_hour'] = df['publish_time'].dt.hour
+    df['publish_day'] = df['publish_time'].dt.day_name()
+    return df
+
+
+def encode_categorical(df):
+    """One-hot encoding category_name dan publish_day menjadi kolom cat_* dan day_*."""
+    df = pd.concat([df, pd.get_dummies(df['category_name'], prefix='cat')], axis=1)
+    df = pd.concat([df, pd.get_dummies(df['publish_day'], prefix='day')], axis=1)
+    return df.drop(columns=['category_name', 'publish_day'])
+
+
+def prepare_records(records, scaler, feature_columns):
+    """Mengubah data mentah (view, publish_time, category_name) menjadi fitur model.
+
+    Raise KeyError jika kolom wajib tidak ada, dan ValueError jika nilainya kosong
+    atau tidak valid. Hanya kolom dummy (cat_*, day_*) yang boleh diisi 0.
+    """
+    df = pd.DataFrame(records)
+    missing = [field for field in REQUIRED_FIELDS if field not in df.columns]
+    if missing:
+        raise KeyError(f"Kolom wajib tidak ada: {missing}")
+    if 'category_name' not in df.columns:
+        df['category_name'] = None
+
+    df = add_time_features(df)
+    df['view'] = pd.to_numeric(df['view'], errors='coerce')
+    invalid = df[['view', 'publish_hour']].isna().any()
+    if invalid.any():
+        raise ValueError(f"Nilai kosong atau tidak valid pada kolom: {invalid.index[invalid].tolist()}")
+
+    df = encode_categorical(df)
+    X = df.reindex(columns=feature_columns)
+    dummy_columns = [c for c in feature_columns if c.startswith(('cat_', 'day_'))]
+    X[dummy_columns] = X[dummy_columns].fillna(0)
+    if X.isna().any().any():
+        raise ValueError(f"Fitur tidak lengkap: {X.columns[X.isna().any()].tolist()}")
+    X = X.astype(float)
+    X[NUMERICAL_FEATURES] = scaler.transform(X[NUMERICAL_FEATURES])
+    return X
+
+
+def new_figure(figsize):
+    # Figure tanpa pyplot supaya aman dibuat dari beberapa thread sekaligus
+    fig = Figure(figsize=figsize)
+    return fig, fig.add_subplot()
+
+
+# ----------------------------------------------------------------------
+# Stage
+# ----------------------------------------------------------------------
+def stage_load(config):
+    # Load CSV dengan fix DtypeWarning
+    df = pd.read_csv(os.path.join(config['data_dir'], 'trending.csv'), low_memory=False, dtype={'category_id': str})
+
+    with open(os.path.join(config['data_dir'], 'category.json'), 'r') as f:
+        category_data = json.load(f)
+
+    # Mapping kategori
+    category_mapping = {item['id']: item['snippet']['title'] for item in category_data['items']}
+    df['category_name'] = df['category_id'].map(category_mapping)
+    return df
+
+
+def stage_profile(config, df):
+    print("Jumlah data:", df.shape)
+    print("Missing Values per Kolom:")
+    print(df.isnull().sum())
+    print("Jumlah Data Duplikat:", df.duplicated().sum())
+
+    df = df.copy()
+    df['publish_hour'] = pd.to_datetime(df['publish_time'], errors='coerce').dt.hour
+    os.makedirs(config['output_dir'], exist_ok=True)
+    paths = []
+
+    def save(fig, title):
+        path = os.path.join(config['output_dir'], f"{title}.png")
+        fig.tight_layout()
+        fig.savefig(path)
+        paths.append(path)
+
+    fig, ax = new_figure((10, 6))
+    sns.countplot(data=df, x='publish_hour', order=sorted(df['publish_hour'].dropna().unique()), ax=ax)
+    ax.set_title("Distribusi Jam Publikasi Video")
+    ax.set_xlabel("Jam (0-23)")
+    ax.set_ylabel("Jumlah Video")
+    ax.tick_params(axis='x', rotation=45)
+    save(fig, "Distribusi Jam Publikasi Video")
+
+    fig, ax = new_figure((10, 6))
+    sns.histplot(df['view'], bins=50, kde=True, ax=ax)
+    ax.set_xscale('log')  # Menggunakan skala logaritmik karena range views sangat lebar
+    ax.set_title("Distribusi Jumlah Views")
+    ax.set_xlabel("Views")
+    ax.set_ylabel("Frekuensi")
+    save(fig, "Distribusi Jumlah Views")
+
+    fig, ax = new_figure((10, 6))
+    sns.histplot(df['like'], bins=50, kde=True, color='green', ax=ax)
+    ax.set_xscale('log')  # Menggunakan skala logaritmik juga untuk likes
+    ax.set_title("Distribusi Jumlah Likes")
+    ax.set_xlabel("Likes")
+    ax.set_ylabel("Frekuensi")
+    save(fig, "Distribusi Jumlah Likes")
+
+    fig, ax = new_figure((10, 6))
+    sns.heatmap(df[['view', 'like', 'comment']].corr(), annot=True, cmap="YlGnBu", ax=ax)
+    ax.set_title("Korelasi antar Fitur Numerik")
+    save(fig, "Korelasi antar Fitur Numerik")
+
+    fig, ax = new_figure((12, 6))
+    sns.boxplot(data=df, x='category_name', y='view', ax=ax)
+    ax.tick_params(axis='x', rotation=45)
+    ax.set_title("Distribusi Views per Kategori")
+    save(fig, "Distribusi Views per Kategori")
+
+    return paths
+
+
+def stage_featurize(config, df):
+    df = df.drop(columns=['video_id', 'thumbnail_url', 'thumbnail_width', 'thumbnail_height'], errors='ignore')
+    df['description'] = df['description'].fillna("No description")
+    df['tags'] = df['tags'].fillna("No tags")
+
+    df = add_time_features(df)
+
+    # Feature engineering untuk target watch_time_proxy
+    df = df[df['view'] > 0].copy()
+    df['engagement_score'] = (df['like'] + df['comment']) / df['view']
+    df[TARGET] = df['view'] * df['engagement_score']
+
+    df = encode_categorical(df)
+    df_model = df.drop(columns=DROP_COLS, errors='ignore').dropna()
+
+    X = df_model.drop(columns=[TARGET, 'like', 'comment', 'engagement_score'], errors='ignore')
+    y = df_model[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Standarisasi fitur numerik, scaler hanya di-fit pada data training
+    scaler = StandardScaler()
+    scaler.fit(X_train[NUMERICAL_FEATURES])
+    X_train = X_train.copy()
+    X_test = X_test.copy()
+    X_train[NUMERICAL_FEATURES] = scaler.transform(X_train[NUMERICAL_FEATURES])
+    X_test[NUMERICAL_FEATURES] = scaler.transform(X_test[NUMERICAL_FEATURES])
+
+    return {
+        'X_train': X_train, 'X_test': X_test,
+        'y_train': y_train, 'y_test': y_test,
+        'scaler': scaler, 'feature_columns': list(X.columns),
+    }
+
+
+def stage_train_lr(config, data):
+    lr_model = LinearRegression()
+    lr_model.fit(data['X_train'], data['y_train'])
+    return lr_model
+
+
+def stage_train_rf(config, data):
+    rf_model = RandomForestRegressor(random_state=42, n_jobs=config['jobs'])
+    rf_model.fit(data['X_train'], data['y_train'])
+    return rf_model
+
+
+def stage_evaluate(config, data, lr_model, rf_model):
+    model_dict = {
+        'Linear Regression': lr_model,
+        'Random Forest': rf_model
+    }
+    metrics = pd.DataFrame(columns=['mae', 'r2', 'mse_train', 'mse_test'], index=list(model_dict), dtype=float)
+    for name, model in model_dict.items():
+        y_train_pred = model.predict(data['X_train'])
+        y_test_pred = model.predict(data['X_test'])
+        metrics.loc[name, 'mae'] = mean_absolute_error(data['y_test'], y_test_pred)
+        metrics.loc[name, 'r2'] = r2_score(data['y_test'], y_test_pred)
+        # MSE dibagi 1000 untuk memperkecil skala, sama seperti di notebook
+        metrics.loc[name, 'mse_train'] = mean_squared_error(data['y_train'], y_train_pred) / 1e3
+        metrics.loc[name, 'mse_test'] = mean_squared_error(data['y_test'], y_test_pred) / 1e3
+    print(metrics)
+    return metrics
+
+
+def stage_report(config, data, rf_model, metrics):
+    os.makedirs(config['output_dir'], exist_ok=True)
+    paths = []
+
+    metrics_path = os.path.join(config['output_dir'], 'metrics.csv')
+    metrics.to_csv(metrics_path)
+    paths.append(metrics_path)
+
+    mse_df = metrics[['mse_train', 'mse_test']].rename(columns={'mse_train': 'train', 'mse_test': 'test'})
+    fig, ax = new_figure((8, 4))
+    mse_df.sort_values(by='test', ascending=False).plot(kind='barh', ax=ax, zorder=3)
+    ax.set_title("Mean Squared Error (dibagi 1000)")
+    ax.set_xlabel("MSE")
+    ax.grid(zorder=0)
+    fig.tight_layout()
+    mse_path = os.path.join(config['output_dir'], 'mse_evaluasi_output.png')
+    fig.savefig(mse_path)
+    paths.append(mse_path)
+
+    # Fitur yang paling berpengaruh terhadap prediksi model akhir (Random Forest)
+    importance = permutation_importance_summary(rf_model, data['X_test'], data['y_test'], n_jobs=config['jobs'])
+    importance_path = os.path.join(config['output_dir'], 'feature_importance.csv')
+    importance.to_csv(importance_path)
+    paths.append(importance_path)
+    print(importance.head(10))
+
+    return paths
+
+
+class Stage:
+    """Satu langkah pipeline: fungsi, stage yang dibutuhkan, dan parameter config yang dipakai."""
+
+    def __init__(self, name, fn, deps=(), params=(), uses=(), inputs=(), constants=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.params = tuple(params)
+        # Helper yang dipanggil fn, supaya perubahan di helper juga mengubah key cache
+        self.uses = tuple(uses)
+        # File input (relatif terhadap data_dir) yang isinya ikut di-hash
+        self.inputs = tuple(inputs)
+        # Nama konstanta modul yang dibaca fn, nilainya ikut di-hash
+        self.constants = tuple(constants)
+
+
+STAGES = {
+    stage.name: stage for stage in [
+        Stage('load', stage_load, params=('data_dir',), inputs=('trending.csv', 'category.json')),
+        Stage('profile', stage_profile, deps=('load',), params=('output_dir',), uses=(new_figure,)),
+        Stage('featurize', stage_featurize, deps=('load',), uses=(add_time_features, encode_categorical),
+              constants=('DROP_COLS', 'NUMERICAL_FEATURES', 'TARGET')),
+        Stage('train_lr', stage_train_lr, deps=('featurize',)),
+        Stage('train_rf', stage_train_rf, deps=('featurize',)),
+        Stage('evaluate', stage_evaluate, deps=('featurize', 'train_lr', 'train_rf')),
+        Stage('report', stage_report, deps=('featurize', 'train_rf', 'evaluate'),
+              params=('output_dir',), uses=(new_figure, permutation_importance_summary)),
+    ]
+}
+
+EDA_STAGES = {'profile'}
+
+# Stage target untuk setiap perintah CLI
+COMMANDS = {
+    'load': ['load'],
+    'profile': ['profile'],
+    'featurize': ['featurize'],
+    'train': ['train_lr', 'train_rf'],
+    'evaluate': ['evaluate'],
+    'report': ['profile', 'report'],
+    'serve': ['featurize', 'train_lr', 'train_rf'],
+}
+
+
+# ----------------------------------------------------------------------
+# Cache dan eksekusi DAG
+# ----------------------------------------------------------------------
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_keys(config):
+    """Menghitung key cache setiap stage (urutan STAGES sudah topologis)."""
+    keys = {}
+    for stage in STAGES.values():
+        digest = hashlib.sha256()
+        digest.update(stage.name.encode())
+        for fn in (stage.fn, *stage.uses):
+            digest.update(inspect.getsource(fn).encode())
+        digest.update(json.dumps({p: config[p] for p in stage.params}, sort_keys=True).encode())
+        digest.update(json.dumps({c: globals()[c] for c in stage.constants}, sort_keys=True).encode())
+        for name in stage.inputs:
+            digest.update(file_hash(os.path.join(config['data_dir'], name)).encode())
+        for dep in stage.deps:
+            digest.update(keys[dep].encode())
+        keys[stage.name] = digest.hexdigest()[:16]
+    return keys
+
+
+def cache_path(config, name, key):
+    return os.path.join(config['cache_dir'], f"{name}-{key}.joblib")
+
+
+def resolve(targets, skip_eda=False):
+    """Semua stage yang dibutuhkan oleh target, termasuk stage sebelumnya."""
+    needed = set()
+    stack = [t for t in targets if not (skip_eda and t in EDA_STAGES)]
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(STAGES[name].deps)
+    return needed
+
+
+def run_pipeline(targets, config):
+    """Menjalankan stage yang dibutuhkan untuk target dan mengembalikan output target.
+
+    Stage dengan key yang sudah ada di cache tidak dijalankan ulang; output-nya hanya
+    dibaca dari disk jika dibutuhkan oleh stage lain yang harus dijalankan.
+    """
+    os.makedirs(config['cache_dir'], exist_ok=True)
+    keys = stage_keys(config)
+    needed = resolve(targets, config['skip_eda'])
+    targets = [t for t in targets if t in needed]
+
+    to_run = {
+        name for name in needed
+        if config['force'] or not os.path.exists(cache_path(config, name, keys[name]))
+    }
+    results = {}
+
+    def get(name):
+        if name not in results:
+            results[name] = joblib.load(cache_path(config, name, keys[name]))
+        return results[name]
+
+    def execute(name):
+        stage = STAGES[name]
+        print(f"[{name}] running")
+        output = stage.fn(config, *[results[dep] for dep in stage.deps])
+        joblib.dump(output, cache_path(config, name, keys[name]))
+        return output
+
+    for name in needed - to_run:
+        print(f"[{name}] cached ({keys[name]})")
+
+    pending = set(to_run)
+    running = {}
+    with ThreadPoolExecutor(max_workers=config['workers']) as executor:
+        while pending or running:
+            for name in sorted(pending):
+                deps = STAGES[name].deps
+                if all(dep not in pending and dep not in running.values() for dep in deps):
+                    # Dependency yang tidak dijalankan ulang dibaca dari cache
+                    for dep in deps:
+                        get(dep)
+                    running[executor.submit(execute, name)] = name
+                    pending.discard(name)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return {name: get(name) for name in targets}
+
+
+# ----------------------------------------------------------------------
+# Serving
+# ----------------------------------------------------------------------
+class DriftWindow:
+    """Mengumpulkan baris dari request serving sebelum dicek drift-nya.
+
+    Satu request sering hanya berisi satu baris, dan histogram satu baris selalu
+    terlihat drift. Karena itu baris dikumpulkan sampai `size` baris, baru kemudian
+    dibandingkan dengan data referensi melalui monitor.update() (yang juga bisa
+    memicu retrain jika ada baris berlabel).
+    """
+
+    def __init__(self, monitor, size):
+        self.monitor = monitor
+        self.size = size
+        self._batches = deque()
+        self._rows = 0
+        self.last_report = None
+
+    def add(self, X, y_pred, y_true=None):
+        """Menambahkan baris prediksi; mengembalikan True jika window baru saja dicek."""
+        y_true = pd.Series(y_true, index=X.index, dtype=float) if y_true is not None else None
+        self._batches.append((X, pd.Series(y_pred, index=X.index), y_true))
+        self._rows += len(X)
+        if self._rows < self.size:
+            return False
+
+        X_window = pd.concat([batch for batch, _, _ in self._batches])
+        labeled = [(batch, pred, true) for batch, pred, true in self._batches if true is not None]
+        self._batches.clear()
+        self._rows = 0
+
+        if labeled:
+            # Baris berlabel menjadi data retrain dan dasar rolling MAE
+            y_lab = pd.concat([true for _, _, true in labeled])
+            mask = y_lab.notna().to_numpy()
+            X_lab = pd.concat([batch for batch, _, _ in labeled])[mask]
+            pred_lab = pd.concat([pred for _, pred, _ in labeled])[mask]
+            if mask.any():
+                self.monitor.add_labeled(X_lab, y_lab[mask])
+                self.monitor.record_predictions(y_lab[mask], pred_lab)
+
+        self.last_report, _ = self.monitor.update(X_window)
+        return True
+
+
+def validated_retrain_fn(monitor, data):
+    """retrain_fn untuk DriftMonitor yang hanya mengganti model jika tidak lebih buruk.
+
+    Model baru dilatih pada data training ditambah baris berlabel dari buffer, lalu
+    MAE-nya dibandingkan dengan model saat ini pada data testing (held-out). Label
+    dari client tidak bisa langsung mengganti model tanpa pengecekan ini.
+    """
+
+    def retrain(X, y):
+        X_fit = pd.concat([data['X_train'].astype(float), X[data['X_train'].columns].astype(float)])
+        y_fit = pd.concat([data['y_train'], y])
+        current = dict(monitor.models)
+        candidates = retrain_models(current, X_fit, y_fit)
+
+        models = {}
+        for name, candidate in candidates.items():
+            mae_new = mean_absolute_error(data['y_test'], candidate.predict(data['X_test']))
+            mae_old = mean_absolute_error(data['y_test'], current[name].predict(data['X_test']))
+            models[name] = candidate if mae_new <= mae_old else current[name]
+            print(f"[retrain] {name}: MAE test {mae_old:.3f} -> {mae_new:.3f}, "
+                  f"{'dipakai' if models[name] is candidate else 'ditolak'}")
+        # Histogram referensi mengikuti distribusi baris terbaru yang memicu retrain
+        return models, X
+
+    return retrain
+
+
+def serve(config):
+    outputs = run_pipeline(COMMANDS['serve'], config)
+    data = outputs['featurize']
+    models = {'lr': outputs['train_lr'], 'rf': outputs['train_rf']}
+
+    # Monitoring drift fitur terhadap data training; retrain memakai baris berlabel dari request
+    monitor = DriftMonitor(
+        models,
+        mae_threshold=config['mae_threshold'],
+        min_retrain_rows=config['min_retrain_rows'],
+    )
+    monitor.retrain_fn = validated_retrain_fn(monitor, data)
+    monitor.fit_reference(data['X_train'])
+    window = DriftWindow(monitor, config['drift_window'])
+
+    class PredictHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != '/predict':
+                self.send_error(404)
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                records = json.loads(self.rfile.read(length))
+                X = prepare_records(records, data['scaler'], data['feature_columns'])
+                prediction = monitor.models['rf'].predict(X)
+                # Record boleh menyertakan nilai aktual watch_time_proxy sebagai label
+                labels = [record.get(TARGET) for record in records]
+                y_true = labels if any(label is not None for label in labels) else None
+                window.add(X, prediction, y_true)
+                report = window.last_report
+                rolling_mae = monitor.rolling_mae
+                body = {
+                    'prediction': prediction.tolist(),
+                    # Hasil pengecekan window terakhir (None jika window pertama belum penuh)
+                    'drift_features': None if report is None else report.index[report['drift']].tolist(),
+                    'rolling_mae': None if np.isnan(rolling_mae) else rolling_mae,
+                    'retraining': monitor.is_retraining,
+                }
+            except (ValueError, KeyError, TypeError, AttributeError) as exc:
+                self.send_error(400, str(exc))
+                return
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = HTTPServer((config['host'], config['port']), PredictHandler)
+    print(f"Serving POST /predict di http://{config['host']}:{config['port']}")
+    server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline prediksi durasi tonton video YouTube")
+    parser.add_argument('command', choices=list(COMMANDS))
+    parser.add_argument('--data-dir', default='dataset')
+    parser.add_argument('--output-dir', default='output_image')
+    parser.add_argument('--cache-dir', default='.pipeline_cache')
+    parser.add_argument('--skip-eda', action='store_true', help="Lewati stage EDA/plot (mode headless untuk batch job)")
+    parser.add_argument('--force', action='store_true', help="Jalankan ulang semua stage tanpa memakai cache")
+    parser.add_argument('--workers', type=int, default=4, help="Jumlah stage yang boleh berjalan paralel")
+    parser.add_argument('--jobs', type=int, default=-1, help="n_jobs untuk Random Forest dan permutation importance")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--drift-window', type=int, default=1000,
+                        help="Jumlah baris request yang dikumpulkan sebelum pengecekan drift")
+    parser.add_argument('--mae-threshold', type=float, default=None,
+                        help="Batas rolling MAE prediksi berlabel yang memicu retrain")
+    parser.add_argument('--min-retrain-rows', type=int, default=1000,
+                        help="Jumlah minimum baris berlabel sebelum retrain dijalankan")
+    args = parser.parse_args(argv)
+
+    config = {
+        'data_dir': args.data_dir,
+        'output_dir': args.output_dir,
+        'cache_dir': args.cache_dir,
+        'skip_eda': args.skip_eda,
+        'force': args.force,
+        'workers': args.workers,
+        'jobs': args.jobs,
+        'host': args.host,
+        'port': args.port,
+        'drift_window': args.drift_window,
+        'mae_threshold': args.mae_threshold,
+        'min_retrain_rows': args.min_retrain_rows,
+    }
+
+    if args.command == 'serve':
+        serve(config)
+    else:
+        run_pipeline(COMMANDS[args.command], config)
+
+
+if __name__ == '__main__':
+    main()
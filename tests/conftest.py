@@ -0,0 +1,27 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Modul proyek berada di root repository (bukan package), jadi root ditambahkan ke sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_data():
+    """Factory data sintetis berbentuk fitur model (view, publish_hour, cat_*, day_*)."""
+
+    def factory(n=500, seed=0, view_shift=0.0, music_share=0.3):
+        rng = np.random.RandomState(seed)
+        X = pd.DataFrame({
+            'view': rng.normal(view_shift, 1, n),
+            'publish_hour': rng.normal(0, 1, n),
+            'cat_Music': (rng.random(n) < music_share).astype(float),
+            'day_Sunday': (rng.random(n) < 0.15).astype(float),
+        })
+        y = 5 * X['view'] + 2 * X['publish_hour'] * X['cat_Music'] - X['day_Sunday'] + rng.normal(0, 0.1, n)
+        return X, y
+
+    return factory
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+import explainability
+from explainability import (
+    get_explainer,
+    linear_attributions,
+    model_version,
+    permutation_importance_summary,
+    saabas_attributions,
+)
+
+
+def test_saabas_attributions_sum_to_prediction(make_data):
+    X, y = make_data()
+    rf_model = RandomForestRegressor(n_estimators=10, random_state=42).fit(X, y)
+
+    attr = saabas_attributions(rf_model, X, chunk_size=64)
+    expected_value = get_explainer(rf_model, list(X.columns)).expected_value
+
+    np.testing.assert_allclose(attr.sum(axis=1) + expected_value, rf_model.predict(X), rtol=1e-7, atol=1e-7)
+
+
+def test_linear_attributions_sum_to_prediction(make_data):
+    X, y = make_data()
+    lr_model = LinearRegression().fit(X, y)
+
+    attr = linear_attributions(lr_model, X, X_background=X)
+    expected_value = get_explainer(lr_model, list(X.columns), X).expected_value
+
+    np.testing.assert_allclose(attr.sum(axis=1) + expected_value, lr_model.predict(X), rtol=1e-7, atol=1e-7)
+    np.testing.assert_allclose(expected_value, lr_model.predict(X).mean())
+
+
+def test_attribution_functions_reject_other_models(make_data):
+    X, y = make_data()
+    with pytest.raises(TypeError):
+        saabas_attributions(LinearRegression().fit(X, y), X)
+
+
+def test_model_version_is_computed_once_per_model(make_data, monkeypatch):
+    X, y = make_data()
+    lr_model = LinearRegression().fit(X, y)
+
+    hashed = []
+    original_hash = explainability.joblib_hash
+
+    def counting_hash(obj):
+        hashed.append(obj)
+        return original_hash(obj)
+
+    monkeypatch.setattr(explainability, 'joblib_hash', counting_hash)
+    assert model_version(lr_model) == model_version(lr_model)
+    assert get_explainer(lr_model, list(X.columns)) is get_explainer(lr_model, list(X.columns))
+    assert sum(obj is lr_model for obj in hashed) == 1
+
+
+def test_permutation_importance_subsamples_and_caches(make_data, monkeypatch):
+    X, y = make_data(n=2000)
+    lr_model = LinearRegression().fit(X, y)
+
+    calls = []
+    original = explainability.permutation_importance
+
+    def counting_permutation_importance(model, X_sub, y_sub, **kwargs):
+        calls.append(len(X_sub))
+        return original(model, X_sub, y_sub, **kwargs)
+
+    monkeypatch.setattr(explainability, 'permutation_importance', counting_permutation_importance)
+
+    result = permutation_importance_summary(lr_model, X, y, n_samples=300, n_repeats=2, n_jobs=1)
+    assert calls == [300]
+    assert sorted(result.index) == sorted(X.columns)
+    assert result.index[0] == 'view'
+
+    # Model dan data yang sama memakai hasil dari cache
+    assert permutation_importance_summary(lr_model, X, y, n_samples=300, n_repeats=2, n_jobs=1) is result
+    assert calls == [300]
+
+    # Versi model baru dihitung ulang
+    other_model = LinearRegression().fit(X, y * 2)
+    permutation_importance_summary(other_model, X, y, n_samples=300, n_repeats=2, n_jobs=1)
+    assert calls == [300, 300]
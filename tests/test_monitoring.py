@@ -0,0 +1,73 @@
+from sklearn.linear_model import LinearRegression
+
+from monitoring import DriftMonitor
+
+
+def test_dummy_column_with_mostly_ones_detects_drift(make_data):
+    X_train, _ = make_data(5000, seed=0, music_share=0.95)
+    monitor = DriftMonitor({}).fit_reference(X_train)
+
+    X_new, _ = make_data(5000, seed=1, music_share=0.3)
+    report = monitor.compare(X_new)
+
+    assert report.loc['cat_Music', 'drift']
+    assert not report.loc['publish_hour', 'drift']
+
+
+def test_retrain_uses_buffered_batch_and_refits_reference(make_data):
+    X_train, y_train = make_data(5000, seed=0)
+    model = LinearRegression().fit(X_train, y_train)
+    monitor = DriftMonitor({'lr': model}).fit_reference(X_train)
+
+    X_new, y_new = make_data(5000, seed=1, view_shift=3.0)
+    report, started = monitor.update(X_new, y_true=y_new, y_pred=model.predict(X_new))
+    assert report.loc['view', 'drift']
+    assert started
+    monitor.wait_for_retrain()
+
+    assert monitor.retrain_count == 1
+    assert monitor.models['lr'] is not model
+    # Setelah retrain, distribusi baru menjadi referensi sehingga tidak ada retrain berulang
+    X_next, y_next = make_data(5000, seed=2, view_shift=3.0)
+    report, started = monitor.update(X_next, y_true=y_next)
+    assert not report['drift'].any()
+    assert not started
+
+
+def test_retrain_waits_for_min_retrain_rows(make_data):
+    X_train, y_train = make_data(5000, seed=0)
+    monitor = DriftMonitor({'lr': LinearRegression().fit(X_train, y_train)}, min_retrain_rows=1000)
+    monitor.fit_reference(X_train)
+
+    X_small, y_small = make_data(5, seed=1, view_shift=3.0)
+    _, started = monitor.update(X_small, y_true=y_small)
+    assert not started
+
+    X_more, y_more = make_data(995, seed=2, view_shift=3.0)
+    _, started = monitor.update(X_more, y_true=y_more)
+    assert started
+    monitor.wait_for_retrain()
+    assert monitor.retrain_count == 1
+
+
+def test_failed_retrain_keeps_buffered_batches(make_data):
+    def failing_retrain(X, y):
+        raise RuntimeError("retrain gagal")
+
+    X_train, _ = make_data(2000, seed=0)
+    monitor = DriftMonitor({}, retrain_fn=failing_retrain, min_retrain_rows=100).fit_reference(X_train)
+
+    X_new, y_new = make_data(500, seed=1, view_shift=3.0)
+    _, started = monitor.update(X_new, y_true=y_new)
+    assert started
+    monitor.wait_for_retrain()
+
+    assert isinstance(monitor.last_error, RuntimeError)
+    assert monitor.retrain_count == 0
+    assert monitor._buffer_rows == 500
+    # Data yang dikembalikan ke buffer bisa dipakai lagi untuk retrain berikutnya
+    monitor.retrain_fn = None
+    monitor.models = {'lr': LinearRegression().fit(X_train, make_data(2000, seed=0)[1])}
+    assert monitor.trigger_retrain()
+    monitor.wait_for_retrain()
+    assert monitor.retrain_count == 1
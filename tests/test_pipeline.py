@@ -0,0 +1,161 @@
+import threading
+
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+import pipeline
+from monitoring import DriftMonitor
+
+
+def make_config(tmp_path):
+    (tmp_path / 'trending.csv').write_text("video_id,view\na,1\n")
+    (tmp_path / 'category.json').write_text('{"items": []}')
+    return {'data_dir': str(tmp_path), 'output_dir': str(tmp_path / 'out')}
+
+
+# Stage tiruan untuk menguji run_pipeline tanpa dataset asli
+RUNS = []
+BARRIER = None
+
+
+def stub_source(config):
+    RUNS.append('source')
+    return config['seed']
+
+
+def stub_plot(config, value):
+    RUNS.append('plot')
+    if BARRIER is not None:
+        BARRIER.wait()
+    return f"plot-{value}"
+
+
+def stub_features(config, value):
+    RUNS.append('features')
+    if BARRIER is not None:
+        BARRIER.wait()
+    return value * config['scale']
+
+
+def stub_model(config, features):
+    RUNS.append('model')
+    return features + 1
+
+
+@pytest.fixture
+def stub_stages(tmp_path, monkeypatch):
+    global BARRIER
+    RUNS.clear()
+    BARRIER = None
+    stages = {stage.name: stage for stage in [
+        pipeline.Stage('source', stub_source, params=('seed',)),
+        pipeline.Stage('plot', stub_plot, deps=('source',)),
+        pipeline.Stage('features', stub_features, deps=('source',), params=('scale',)),
+        pipeline.Stage('model', stub_model, deps=('features',)),
+    ]}
+    monkeypatch.setattr(pipeline, 'STAGES', stages)
+    monkeypatch.setattr(pipeline, 'EDA_STAGES', {'plot'})
+    return {
+        'data_dir': str(tmp_path), 'cache_dir': str(tmp_path / 'cache'),
+        'seed': 2, 'scale': 10, 'skip_eda': False, 'force': False, 'workers': 4,
+    }
+
+
+def test_run_pipeline_reuses_cache_and_reruns_downstream(stub_stages):
+    config = stub_stages
+    outputs = pipeline.run_pipeline(['plot', 'model'], config)
+    assert outputs == {'plot': 'plot-2', 'model': 21}
+    assert sorted(RUNS) == ['features', 'model', 'plot', 'source']
+
+    # Panggilan kedua sepenuhnya dari cache
+    RUNS.clear()
+    assert pipeline.run_pipeline(['plot', 'model'], config) == outputs
+    assert RUNS == []
+
+    # Mengubah parameter stage features hanya menjalankan ulang features dan model
+    RUNS.clear()
+    config['scale'] = 100
+    assert pipeline.run_pipeline(['plot', 'model'], config) == {'plot': 'plot-2', 'model': 201}
+    assert sorted(RUNS) == ['features', 'model']
+
+
+def test_run_pipeline_skip_eda_drops_plot_stage(stub_stages):
+    config = dict(stub_stages, skip_eda=True)
+    outputs = pipeline.run_pipeline(['plot', 'model'], config)
+    assert outputs == {'model': 21}
+    assert 'plot' not in RUNS
+
+
+def test_run_pipeline_runs_independent_stages_in_parallel(stub_stages):
+    global BARRIER
+    # plot dan features hanya bisa melewati barrier jika keduanya berjalan bersamaan
+    BARRIER = threading.Barrier(2, timeout=10)
+    outputs = pipeline.run_pipeline(['plot', 'model'], stub_stages)
+    assert outputs == {'plot': 'plot-2', 'model': 21}
+    assert not BARRIER.broken
+
+
+def test_stage_keys_change_with_featurize_constants(tmp_path, monkeypatch):
+    config = make_config(tmp_path)
+    before = pipeline.stage_keys(config)
+
+    monkeypatch.setattr(pipeline, 'DROP_COLS', pipeline.DROP_COLS + ['tags_count'])
+    after = pipeline.stage_keys(config)
+
+    assert before['load'] == after['load']
+    assert before['profile'] == after['profile']
+    for name in ['featurize', 'train_lr', 'train_rf', 'evaluate', 'report']:
+        assert before[name] != after[name]
+
+
+def test_prepare_records_requires_numeric_inputs():
+    scaler = StandardScaler().fit(pd.DataFrame({'view': [1.0, 100.0], 'publish_hour': [0.0, 23.0]}))
+    feature_columns = ['view', 'publish_hour', 'cat_Music', 'day_Sunday']
+    record = {'view': 50, 'publish_time': '2024-01-07T10:00:00Z', 'category_name': 'Music'}
+
+    X = pipeline.prepare_records([record], scaler, feature_columns)
+    assert list(X.columns) == feature_columns
+    assert X.loc[0, 'cat_Music'] == 1 and X.loc[0, 'day_Sunday'] == 1
+
+    with pytest.raises(KeyError):
+        pipeline.prepare_records([{'publish_time': record['publish_time']}], scaler, feature_columns)
+    with pytest.raises(ValueError):
+        pipeline.prepare_records([dict(record, view=None)], scaler, feature_columns)
+    with pytest.raises(ValueError):
+        pipeline.prepare_records([dict(record, publish_time='bukan tanggal')], scaler, feature_columns)
+
+
+def test_validated_retrain_keeps_better_current_model(make_data):
+    X_train, y_train = make_data(1000, seed=0)
+    X_test, y_test = make_data(500, seed=1)
+    data = {'X_train': X_train, 'y_train': y_train, 'X_test': X_test, 'y_test': y_test}
+    current = LinearRegression().fit(X_train, y_train)
+    monitor = DriftMonitor({'lr': current})
+    retrain = pipeline.validated_retrain_fn(monitor, data)
+
+    # Label dari client yang salah total menghasilkan model lebih buruk, jadi ditolak
+    X_bad, y_bad = make_data(5000, seed=2)
+    models, X_ref = retrain(X_bad, -100 * y_bad)
+    assert models['lr'] is current
+    assert X_ref is X_bad
+
+    # Label yang benar menghasilkan model yang tidak lebih buruk, jadi dipakai
+    X_good, y_good = make_data(5000, seed=3)
+    models, _ = retrain(X_good, y_good)
+    assert models['lr'] is not current
+
+
+def test_drift_window_waits_for_enough_rows(make_data):
+    X_train, _ = make_data(2000, seed=0)
+    monitor = DriftMonitor({}).fit_reference(X_train)
+    window = pipeline.DriftWindow(monitor, size=500)
+
+    # Satu baris per request seperti di serving: belum ada pengecekan sampai window penuh
+    for i in range(499):
+        assert not window.add(X_train.iloc[[i]], [0.0])
+    assert window.last_report is None
+
+    assert window.add(X_train.iloc[[499]], [0.0])
+    assert not window.last_report['drift'].any()